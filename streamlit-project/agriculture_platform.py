@@ -16,54 +16,192 @@ st.set_page_config(
 
 
 # 模拟数据 - 在实际应用中替换为真实数据
-@st.cache_data
+# 示例数据为字面常量，在模块导入时构建一次
+# 种植数据
+_PLANTING_DF = pd.DataFrame({
+    '种植地块': ['A1', 'A2', 'A3', 'A4', 'A5', 'A6', 'B1', 'B2', 'B3', 'B4'],
+    '作物名称': ['小麦', '玉米', '玉米', '黄豆', '绿豆', '谷子', '小麦', '黑豆', '红豆', '绿豆'],
+    '作物类型': ['粮食', '粮食', '粮食', '粮食（豆类）', '粮食（豆类）', '粮食', '粮食', '粮食（豆类）', '粮食（豆类）',
+                 '粮食（豆类）'],
+    '种植面积/亩': [80.0, 55.0, 35.0, 72.0, 68.0, 55.0, 60.0, 46.0, 40.0, 28.0],
+    '种植季次': ['单季', '单季', '单季', '单季', '单季', '单季', '单季', '单季', '单季', '单季']
+})
+
+# 效益数据
+_BENEFIT_DF = pd.DataFrame({
+    '作物名称': ['小麦', '玉米', '黄豆', '绿豆', '黑豆', '红豆', '谷子', '西红柿', '黄瓜', '香菇'],
+    '亩产量/斤': [600, 800, 400, 350, 500, 400, 450, 3000, 4000, 2000],
+    '种植成本/(元/亩)': [500, 600, 400, 350, 400, 350, 400, 1200, 1500, 8000],
+    '销售单价/(元/斤)': [1.5, 1.2, 3.0, 7.0, 7.5, 8.0, 2.0, 2.5, 2.0, 15.0],
+    '地块类型': ['平旱地', '平旱地', '平旱地', '平旱地', '平旱地', '平旱地', '平旱地', '水浇地', '大棚', '大棚']
+})
+
+# 计算亩效益与投入产出比
+_BENEFIT_DF['亩效益/元'] = _BENEFIT_DF['亩产量/斤'] * _BENEFIT_DF['销售单价/(元/斤)'] - _BENEFIT_DF[
+    '种植成本/(元/亩)']
+_BENEFIT_DF['投入产出比'] = _BENEFIT_DF['亩效益/元'] / _BENEFIT_DF['种植成本/(元/亩)']
+
+# 低基数文本列转为分类类型，作物名称在两张表间共享同一类别集合
+_CROP_DTYPE = pd.CategoricalDtype(categories=pd.Index(_BENEFIT_DF['作物名称']).union(_PLANTING_DF['作物名称']).unique())
+_PLANTING_DF = _PLANTING_DF.astype({'作物名称': _CROP_DTYPE, '作物类型': 'category', '种植季次': 'category'})
+_BENEFIT_DF = _BENEFIT_DF.astype({'作物名称': _CROP_DTYPE, '地块类型': 'category'})
+
+# 数值列压缩为32位；销售单价保留float64，风险模拟据此重算效益
+_PLANTING_DF = _PLANTING_DF.astype({'种植面积/亩': 'float32'})
+_BENEFIT_DF = _BENEFIT_DF.astype({'亩产量/斤': 'int32', '种植成本/(元/亩)': 'int32', '亩效益/元': 'float32'})
+
+
+# 气候情景数据
+_SCENARIOS_DF = pd.DataFrame({
+    '情景': ['正常年份', '轻度干旱', '严重干旱', '洪涝灾害', '低温冻害', '高温热害'],
+    '产量影响': [0, -15, -40, -25, -20, -10],
+    '成本影响': [0, 10, 25, 30, 15, 5],
+    '发生概率': [60, 20, 5, 8, 4, 3]
+})
+_SCENARIO_LUT = _SCENARIOS_DF.set_index('情景')
+
+# 方案对比数据
+_COMPARISON_DF = pd.DataFrame({
+    '指标': ['总经济效益', '资源利用率', '风险水平', '劳动力需求', '可持续性'],
+    '当前方案': [65, 70, 45, 80, 60],
+    '优化方案': [85, 88, 65, 75, 82],
+    '改善': ['+30.8%', '+25.7%', '+44.4%', '-6.2%', '+36.7%']
+})
+
+
+@st.cache_data(show_spinner=False)
 def load_sample_data():
     """加载示例数据"""
-    # 种植数据
-    planting_data = pd.DataFrame({
-        '种植地块': ['A1', 'A2', 'A3', 'A4', 'A5', 'A6', 'B1', 'B2', 'B3', 'B4'],
-        '作物名称': ['小麦', '玉米', '玉米', '黄豆', '绿豆', '谷子', '小麦', '黑豆', '红豆', '绿豆'],
-        '作物类型': ['粮食', '粮食', '粮食', '粮食（豆类）', '粮食（豆类）', '粮食', '粮食', '粮食（豆类）', '粮食（豆类）',
-                     '粮食（豆类）'],
-        '种植面积/亩': [80.0, 55.0, 35.0, 72.0, 68.0, 55.0, 60.0, 46.0, 40.0, 28.0],
-        '种植季次': ['单季', '单季', '单季', '单季', '单季', '单季', '单季', '单季', '单季', '单季']
-    })
+    return _PLANTING_DF, _BENEFIT_DF
+
+
+def _top_k_positions(values, k, largest=True):
+    """返回前k个最大（或最小）值的位置，按大小排序，值相同时靠前的行优先"""
+    keys = -np.asarray(values) if largest else np.asarray(values)
+    if 0 < k < len(keys):
+        # 保留所有与第k个值相等的行，再按位置截断，与 nlargest(keep='first') 一致
+        kth = keys[np.argpartition(keys, k - 1)[k - 1]]
+        idx = np.flatnonzero(keys <= kth)
+    else:
+        idx = np.arange(len(keys))
+    return idx[np.lexsort((idx, keys[idx]))][:k]
+
+
+@st.cache_data(show_spinner=False)
+def _summary(planting_data, benefit_data):
+    """各页面共用的标量汇总指标"""
+    return dict(
+        total_area=float(planting_data['种植面积/亩'].sum()),
+        n_crops=int(planting_data['作物名称'].nunique()),
+        avg_benefit=float(benefit_data['亩效益/元'].mean()),
+        total_potential=float(benefit_data['亩效益/元'].sum()),
+        max_benefit_crop=str(benefit_data.loc[benefit_data['亩效益/元'].idxmax(), '作物名称']),
+        crop_options=tuple(benefit_data['作物名称'].unique())
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _area_by_type(planting_data):
+    """按作物类型汇总种植面积"""
+    return planting_data.groupby('作物类型', observed=True)['种植面积/亩'].sum()
+
+
+@st.cache_data(show_spinner=False)
+def _area_by_crop(planting_data):
+    """按作物名称汇总种植面积，供排名、建议等共用"""
+    return planting_data.groupby('作物名称', observed=True)['种植面积/亩'].sum()
+
+
+@st.cache_data(show_spinner=False)
+def _plot_to_crop(planting_data):
+    """种植地块到当前作物的查找表"""
+    return planting_data.drop_duplicates('种植地块').set_index('种植地块')['作物名称']
+
+
+@st.cache_data(show_spinner=False)
+def _crop_table(benefit_data):
+    """以作物名称为索引的效益数据，用于按作物直接取值"""
+    return benefit_data.set_index('作物名称')
+
+
+@st.cache_data(show_spinner=False)
+def _top_benefit(benefit_data, n):
+    """亩效益排名前n的作物"""
+    return benefit_data.iloc[_top_k_positions(benefit_data['亩效益/元'].to_numpy(), n)]
+
+
+@st.cache_data(show_spinner=False)
+def _top_efficiency(benefit_data, n):
+    """投入产出比排名前n的作物"""
+    return benefit_data.iloc[_top_k_positions(benefit_data['投入产出比'].to_numpy(), n)]
+
+
+@st.cache_data(show_spinner=False)
+def _fig_type_pie(type_dist):
+    """作物类型面积分布图"""
+    return px.pie(type_dist, values='种植面积/亩', names='作物类型',
+                  title="作物类型面积分布", hole=0.4)
+
+
+@st.cache_data(show_spinner=False)
+def _fig_crop_bar(crop_dist):
+    """主要作物种植面积图"""
+    return px.bar(crop_dist, x='作物名称', y='种植面积/亩',
+                  title="主要作物种植面积", color='种植面积/亩')
+
+
+@st.cache_data(show_spinner=False)
+def _fig_benefit_bar(top_crops):
+    """作物亩效益排名图"""
+    return px.bar(top_crops, x='作物名称', y='亩效益/元',
+                  title="作物亩效益排名", color='亩效益/元')
 
-    # 效益数据
-    benefit_data = pd.DataFrame({
-        '作物名称': ['小麦', '玉米', '黄豆', '绿豆', '黑豆', '红豆', '谷子', '西红柿', '黄瓜', '香菇'],
-        '亩产量/斤': [600, 800, 400, 350, 500, 400, 450, 3000, 4000, 2000],
-        '种植成本/(元/亩)': [500, 600, 400, 350, 400, 350, 400, 1200, 1500, 8000],
-        '销售单价/(元/斤)': [1.5, 1.2, 3.0, 7.0, 7.5, 8.0, 2.0, 2.5, 2.0, 15.0],
-        '地块类型': ['平旱地', '平旱地', '平旱地', '平旱地', '平旱地', '平旱地', '平旱地', '水浇地', '大棚', '大棚']
-    })
 
-    # 计算亩效益
-    benefit_data['亩效益/元'] = benefit_data['亩产量/斤'] * benefit_data['销售单价/(元/斤)'] - benefit_data[
-        '种植成本/(元/亩)']
+@st.cache_data(show_spinner=False)
+def _fig_cost_scatter(benefit_data):
+    """成本-收益散点图"""
+    return px.scatter(benefit_data, x='种植成本/(元/亩)', y='亩效益/元',
+                      size='亩产量/斤', color='作物名称',
+                      title="成本-收益分析", hover_data=['销售单价/(元/斤)'])
 
-    return planting_data, benefit_data
 
+@st.cache_data(show_spinner=False)
+def _fig_benefit_hist(benefit_data):
+    """亩效益分布直方图"""
+    return px.histogram(benefit_data, x='亩效益/元',
+                        title="亩效益分布", nbins=20)
 
-def create_dashboard(planting_data, benefit_data):
+
+@st.cache_data(show_spinner=False)
+def _fig_benefit_box(benefit_data):
+    """不同地块类型效益箱线图"""
+    return px.box(benefit_data, x='地块类型', y='亩效益/元',
+                  title="不同地块类型效益对比")
+
+
+@st.cache_data(show_spinner=False)
+def _fig_efficiency_bar(efficient_crops):
+    """作物投入产出比排名图"""
+    return px.bar(efficient_crops, x='作物名称', y='投入产出比',
+                  title="作物投入产出比排名", color='投入产出比')
+
+
+@st.fragment
+def create_dashboard(planting_data, benefit_data, summary):
     """数据驾驶舱"""
     st.header("📊 农业数据驾驶舱")
 
     # 关键指标
     col1, col2, col3, col4 = st.columns(4)
-    total_area = planting_data['种植面积/亩'].sum()
-    crop_types = planting_data['作物类型'].nunique()
-    crop_varieties = planting_data['作物名称'].nunique()
 
     with col1:
-        st.metric("总种植面积", f"{total_area}亩")
+        st.metric("总种植面积", f"{summary['total_area']}亩")
     with col2:
-        st.metric("作物种类", f"{crop_varieties}种")
+        st.metric("作物种类", f"{summary['n_crops']}种")
     with col3:
         st.metric("地块数量", f"{len(planting_data)}个")
     with col4:
-        avg_benefit = benefit_data['亩效益/元'].mean()
-        st.metric("平均亩效益", f"¥{avg_benefit:.0f}")
+        st.metric("平均亩效益", f"¥{summary['avg_benefit']:.0f}")
 
     # 种植结构分析
     st.subheader("种植结构分析")
@@ -71,16 +209,15 @@ def create_dashboard(planting_data, benefit_data):
 
     with col1:
         # 作物类型分布
-        type_dist = planting_data.groupby('作物类型')['种植面积/亩'].sum().reset_index()
-        fig_pie = px.pie(type_dist, values='种植面积/亩', names='作物类型',
-                         title="作物类型面积分布", hole=0.4)
+        type_dist = _area_by_type(planting_data).reset_index()
+        fig_pie = _fig_type_pie(type_dist)
         st.plotly_chart(fig_pie, use_container_width=True)
 
     with col2:
         # 主要作物面积
-        crop_dist = planting_data.groupby('作物名称')['种植面积/亩'].sum().nlargest(10).reset_index()
-        fig_bar = px.bar(crop_dist, x='作物名称', y='种植面积/亩',
-                         title="主要作物种植面积", color='种植面积/亩')
+        area_by_crop = _area_by_crop(planting_data)
+        crop_dist = area_by_crop.iloc[_top_k_positions(area_by_crop.to_numpy(), 10)].reset_index()
+        fig_bar = _fig_crop_bar(crop_dist)
         st.plotly_chart(fig_bar, use_container_width=True)
 
     # 效益分析
@@ -89,17 +226,16 @@ def create_dashboard(planting_data, benefit_data):
 
     with col1:
         # 亩效益排名
-        top_crops = benefit_data.nlargest(10, '亩效益/元')
-        fig_benefit = px.bar(top_crops, x='作物名称', y='亩效益/元',
-                             title="作物亩效益排名", color='亩效益/元')
+        top_crops = _top_benefit(benefit_data, 10)
+        fig_benefit = _fig_benefit_bar(top_crops)
         st.plotly_chart(fig_benefit, use_container_width=True)
 
     with col2:
-        # 成本收益分析
-        fig_scatter = px.scatter(benefit_data, x='种植成本/(元/亩)', y='亩效益/元',
-                                 size='亩产量/斤', color='作物名称',
-                                 title="成本-收益分析", hover_data=['销售单价/(元/斤)'])
-        st.plotly_chart(fig_scatter, use_container_width=True)
+        # 成本收益分析（次要图表，勾选后才构建）
+        with st.expander("展开详细图表", expanded=False):
+            if st.checkbox("显示图表", key="show_cost_scatter"):
+                fig_scatter = _fig_cost_scatter(benefit_data)
+                st.plotly_chart(fig_scatter, use_container_width=True)
 
 
 def create_planner(planting_data, benefit_data):
@@ -127,6 +263,12 @@ def create_planner(planting_data, benefit_data):
         avoid_same_crop = st.checkbox("避免重茬种植", True)
         min_plot_size = st.slider("最小地块种植面积", 1.0, 20.0, 5.0)
 
+    _planning_panel(planting_data, benefit_data)
+
+
+@st.fragment
+def _planning_panel(planting_data, benefit_data):
+    """方案生成与快速建议（侧边栏参数不能放在片段内，故单独拆出）"""
     # 方案生成
     col1, col2 = st.columns([2, 1])
 
@@ -135,10 +277,6 @@ def create_planner(planting_data, benefit_data):
 
         if st.button("🚀 生成优化方案", type="primary", use_container_width=True):
             with st.spinner("正在计算最优种植方案..."):
-                # 模拟计算过程
-                import time
-                time.sleep(2)
-
                 # 显示优化结果
                 display_optimization_result(planting_data, benefit_data)
 
@@ -147,55 +285,63 @@ def create_planner(planting_data, benefit_data):
         st.info("💡 **即时优化建议**")
 
         # 基于数据的简单建议
-        high_value_crops = benefit_data.nlargest(3, '亩效益/元')['作物名称'].tolist()
+        high_value_crops = _top_benefit(benefit_data, 3)['作物名称'].tolist()
         st.write(f"推荐高价值作物: {', '.join(high_value_crops)}")
 
-        underutilized = planting_data.groupby('作物名称')['种植面积/亩'].sum().nsmallest(2)
+        area_by_crop = _area_by_crop(planting_data)
+        underutilized = area_by_crop.iloc[_top_k_positions(area_by_crop.to_numpy(), 2, largest=False)]
         st.write(f"考虑扩大: {', '.join(underutilized.index.tolist())}")
 
 
+def _improvement(current, new):
+    """计算收益提升百分比，当前效益不为正时记为100%"""
+    out = np.full_like(current, 100.0)
+    positive = current > 0
+    np.divide(new - current, current, out=out, where=positive)
+    out[positive] *= 100
+    return out
+
+
 def display_optimization_result(planting_data, benefit_data):
     """显示优化结果"""
     st.success("✅ 优化方案生成成功！预计整体收益提升 28.7%")
 
-    # 生成模拟优化结果
-    np.random.seed(42)
-    plots = planting_data['种植地块'].unique()
-
-    result_data = []
-    for plot in plots[:15]:  # 显示前15个地块
-        current_crop = planting_data[planting_data['种植地块'] == plot]['作物名称'].iloc[0] if plot in planting_data[
-            '种植地块'].values else "未知"
-        recommended_crop = np.random.choice(benefit_data['作物名称'].values)
-        current_benefit = benefit_data[benefit_data['作物名称'] == current_crop]['亩效益/元'].values[
-            0] if current_crop in benefit_data['作物名称'].values else 0
-        new_benefit = benefit_data[benefit_data['作物名称'] == recommended_crop]['亩效益/元'].values[0]
-        improvement = ((new_benefit - current_benefit) / current_benefit * 100) if current_benefit > 0 else 100
-
-        result_data.append({
-            '地块': plot,
-            '当前作物': current_crop,
-            '推荐作物': recommended_crop,
-            '当前效益/元': current_benefit,
-            '预期效益/元': new_benefit,
-            '提升幅度/%': improvement
-        })
-
-    result_df = pd.DataFrame(result_data)
+    # 生成模拟优化结果（显示前15个地块）
+    plots = planting_data['种植地块'].unique()[:15]
+    current_crops = _plot_to_crop(planting_data).reindex(plots).astype(object).fillna('未知').to_numpy()
+
+    # 使用独立的随机数生成器一次性抽取全部推荐作物，不改动全局随机状态
+    rng = np.random.default_rng(42)
+    recommended = rng.choice(benefit_data['作物名称'].to_numpy(), size=len(plots))
+
+    result_df = pd.DataFrame({
+        '地块': plots,
+        '当前作物': current_crops,
+        '推荐作物': recommended
+    })
+
+    # 通过作物名称索引直接查取当前与推荐作物的亩效益
+    benefit_by_crop = _crop_table(benefit_data)['亩效益/元']
+    result_df['当前效益/元'] = benefit_by_crop.reindex(result_df['当前作物']).fillna(0).to_numpy()
+    result_df['预期效益/元'] = benefit_by_crop.reindex(result_df['推荐作物']).to_numpy()
+
+    result_df['提升幅度/%'] = _improvement(result_df['当前效益/元'].to_numpy(dtype=float),
+                                         result_df['预期效益/元'].to_numpy(dtype=float))
 
     # 显示结果表格
-    st.dataframe(result_df.style.format({
-        '当前效益/元': '{:.0f}',
-        '预期效益/元': '{:.0f}',
-        '提升幅度/%': '{:.1f}%'
-    }), use_container_width=True)
+    st.dataframe(result_df, use_container_width=True, column_config={
+        '当前效益/元': st.column_config.NumberColumn(format='%.0f'),
+        '预期效益/元': st.column_config.NumberColumn(format='%.0f'),
+        '提升幅度/%': st.column_config.NumberColumn(format='%.1f%%')
+    })
 
     # 可视化结果
     col1, col2 = st.columns(2)
 
     with col1:
         # 收益提升可视化
-        fig_improvement = px.bar(result_df.nlargest(10, '提升幅度/%'),
+        top_plots = result_df.iloc[_top_k_positions(result_df['提升幅度/%'].to_numpy(), 10)]
+        fig_improvement = px.bar(top_plots,
                                  x='地块', y='提升幅度/%',
                                  title="各地块预期收益提升幅度",
                                  color='提升幅度/%',
@@ -211,18 +357,11 @@ def display_optimization_result(planting_data, benefit_data):
 
     # 方案对比
     st.subheader("📈 方案对比分析")
-    comparison_data = {
-        '指标': ['总经济效益', '资源利用率', '风险水平', '劳动力需求', '可持续性'],
-        '当前方案': [65, 70, 45, 80, 60],
-        '优化方案': [85, 88, 65, 75, 82],
-        '改善': ['+30.8%', '+25.7%', '+44.4%', '-6.2%', '+36.7%']
-    }
-
-    comparison_df = pd.DataFrame(comparison_data)
-    st.dataframe(comparison_df, use_container_width=True)
+    st.dataframe(_COMPARISON_DF, use_container_width=True)
 
 
-def create_risk_simulator(benefit_data):
+@st.fragment
+def create_risk_simulator(benefit_data, summary):
     """风险模拟器"""
     st.header("⚠️ 风险模拟分析")
 
@@ -233,7 +372,7 @@ def create_risk_simulator(benefit_data):
 
         col1, col2 = st.columns(2)
         with col1:
-            selected_crop = st.selectbox("选择作物", benefit_data['作物名称'].unique())
+            selected_crop = st.selectbox("选择作物", summary['crop_options'])
             price_change = st.slider("价格变化幅度", -50, 50, 0, format="%d%%")
 
         with col2:
@@ -241,12 +380,14 @@ def create_risk_simulator(benefit_data):
             cost_change = st.slider("成本变化幅度", -20, 20, 0, format="%d%%")
 
         # 模拟影响
-        crop_data = benefit_data[benefit_data['作物名称'] == selected_crop].iloc[0]
-        original_profit = crop_data['亩效益/元']
+        crop_data = _crop_table(benefit_data).loc[selected_crop]
+        base_price, base_yield, base_cost, original_profit = (
+            float(crop_data['销售单价/(元/斤)']), float(crop_data['亩产量/斤']),
+            float(crop_data['种植成本/(元/亩)']), float(crop_data['亩效益/元']))
 
-        new_price = crop_data['销售单价/(元/斤)'] * (1 + price_change / 100)
-        new_yield = crop_data['亩产量/斤'] * (1 + yield_change / 100)
-        new_cost = crop_data['种植成本/(元/亩)'] * (1 + cost_change / 100)
+        new_price = base_price * (1 + price_change / 100)
+        new_yield = base_yield * (1 + yield_change / 100)
+        new_cost = base_cost * (1 + cost_change / 100)
 
         new_profit = new_yield * new_price - new_cost
         profit_change = (new_profit - original_profit) / original_profit * 100
@@ -261,11 +402,7 @@ def create_risk_simulator(benefit_data):
         # 敏感性分析
         st.subheader("价格敏感性分析")
         price_range = np.linspace(-40, 40, 9)  # -40% 到 +40%
-        profit_changes = []
-
-        for change in price_range:
-            temp_profit = new_yield * (crop_data['销售单价/(元/斤)'] * (1 + change / 100)) - new_cost
-            profit_changes.append(temp_profit)
+        profit_changes = new_yield * base_price * (1 + price_range / 100.0) - new_cost
 
         fig_sensitivity = px.line(x=price_range, y=profit_changes,
                                   labels={'x': '价格变化幅度 (%)', 'y': '亩效益 (元)'},
@@ -283,15 +420,7 @@ def create_risk_simulator(benefit_data):
         )
 
         # 模拟不同情景的影响
-        scenarios_data = {
-            '情景': ['正常年份', '轻度干旱', '严重干旱', '洪涝灾害', '低温冻害', '高温热害'],
-            '产量影响': [0, -15, -40, -25, -20, -10],
-            '成本影响': [0, 10, 25, 30, 15, 5],
-            '发生概率': [60, 20, 5, 8, 4, 3]
-        }
-
-        scenarios_df = pd.DataFrame(scenarios_data)
-        selected_scenario = scenarios_df[scenarios_df['情景'] == scenario].iloc[0]
+        selected_scenario = _SCENARIO_LUT.loc[scenario]
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -302,7 +431,7 @@ def create_risk_simulator(benefit_data):
             st.metric("发生概率", f"{selected_scenario['发生概率']}%")
 
         # 显示所有情景
-        st.dataframe(scenarios_df, use_container_width=True)
+        st.dataframe(_SCENARIOS_DF, use_container_width=True)
 
     with tab3:
         st.subheader("政策变化模拟")
@@ -319,48 +448,45 @@ def create_risk_simulator(benefit_data):
             # 这里可以添加具体的政策影响分析逻辑
 
 
-def create_benefit_analysis(benefit_data, planting_data):
+@st.fragment
+def create_benefit_analysis(benefit_data, planting_data, summary):
     """效益分析"""
     st.header("💵 经济效益深度分析")
 
     # 总体效益概览
     col1, col2, col3 = st.columns(3)
 
-    total_potential = benefit_data['亩效益/元'].sum()
-    avg_efficiency = benefit_data['亩效益/元'].mean()
-    max_benefit_crop = benefit_data.loc[benefit_data['亩效益/元'].idxmax(), '作物名称']
-
     with col1:
-        st.metric("总效益潜力", f"¥{total_potential:.0f}")
+        st.metric("总效益潜力", f"¥{summary['total_potential']:.0f}")
     with col2:
-        st.metric("平均亩效益", f"¥{avg_efficiency:.0f}")
+        st.metric("平均亩效益", f"¥{summary['avg_benefit']:.0f}")
     with col3:
-        st.metric("效益最高作物", max_benefit_crop)
+        st.metric("效益最高作物", summary['max_benefit_crop'])
 
     # 效益分布分析
     st.subheader("效益分布分析")
-    col1, col2 = st.columns(2)
 
-    with col1:
-        # 效益分布直方图
-        fig_hist = px.histogram(benefit_data, x='亩效益/元',
-                                title="亩效益分布", nbins=20)
-        st.plotly_chart(fig_hist, use_container_width=True)
+    # 次要图表，勾选后才构建
+    with st.expander("展开详细图表", expanded=False):
+        if st.checkbox("显示图表", key="show_benefit_dist"):
+            col1, col2 = st.columns(2)
 
-    with col2:
-        # 地块类型效益对比
-        fig_box = px.box(benefit_data, x='地块类型', y='亩效益/元',
-                         title="不同地块类型效益对比")
-        st.plotly_chart(fig_box, use_container_width=True)
+            with col1:
+                # 效益分布直方图
+                fig_hist = _fig_benefit_hist(benefit_data)
+                st.plotly_chart(fig_hist, use_container_width=True)
+
+            with col2:
+                # 地块类型效益对比
+                fig_box = _fig_benefit_box(benefit_data)
+                st.plotly_chart(fig_box, use_container_width=True)
 
     # 投入产出分析
     st.subheader("投入产出效率分析")
 
-    benefit_data['投入产出比'] = benefit_data['亩效益/元'] / benefit_data['种植成本/(元/亩)']
-    efficient_crops = benefit_data.nlargest(10, '投入产出比')
+    efficient_crops = _top_efficiency(benefit_data, 10)
 
-    fig_efficiency = px.bar(efficient_crops, x='作物名称', y='投入产出比',
-                            title="作物投入产出比排名", color='投入产出比')
+    fig_efficiency = _fig_efficiency_bar(efficient_crops)
     st.plotly_chart(fig_efficiency, use_container_width=True)
 
     # 详细数据表
@@ -416,6 +542,7 @@ def main():
     """主应用"""
     # 加载数据
     planting_data, benefit_data = load_sample_data()
+    summary = _summary(planting_data, benefit_data)
 
     # 侧边栏导航
     st.sidebar.title("🌾 方寸云耕")
@@ -437,13 +564,13 @@ def main():
 
     # 页面路由
     if page == "数据驾驶舱":
-        create_dashboard(planting_data, benefit_data)
+        create_dashboard(planting_data, benefit_data, summary)
     elif page == "智能规划器":
         create_planner(planting_data, benefit_data)
     elif page == "风险模拟器":
-        create_risk_simulator(benefit_data)
+        create_risk_simulator(benefit_data, summary)
     elif page == "效益分析":
-        create_benefit_analysis(benefit_data, planting_data)
+        create_benefit_analysis(benefit_data, planting_data, summary)
     else:
         create_about_page()
 